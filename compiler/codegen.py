@@ -3,12 +3,89 @@ Code Generator for the Mini Compiler.
 This module generates assembly code for a hypothetical machine from Three-Address Code (TAC).
 """
 
-from typing import List
+import heapq
+import io
+import re
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from .intermediate import (
     TACInstruction, Assignment, BinaryOperation, UnaryOperation,
-    Print, Jump, ConditionalJump, Label
+    Print, Jump, ConditionalJump, Label, Const, VarRef, Operand, is_temp, used_operands
 )
 
+# Registers handed out to temporaries by the linear-scan allocator.
+# The remaining registers are kept as scratch for loading variables/literals.
+REGISTER_NAMES = tuple(f"R{i}" for i in range(8))
+ALLOCATABLE_REGISTERS = REGISTER_NAMES[:6]
+SCRATCH_REGISTERS = REGISTER_NAMES[6:]
+# Bit i set means register Ri is a scratch register
+SCRATCH_MASK = sum(1 << REGISTER_NAMES.index(reg) for reg in SCRATCH_REGISTERS)
+
+# Peephole patterns over emitted assembly lines
+PEEPHOLE_WINDOW = 4
+_STORE_RE = re.compile(r'    STORE (R\d+), (\S+)$')
+_LOAD_RE = re.compile(r'    LOAD (R\d+), (\S+)$')
+_WRITES_REG_RE = re.compile(r'    (?:LOAD|MOV|ADD|SUB|MUL|DIV|NEG|SET\S*) (R\d+)')
+
+def _instruction_operands(inst: TACInstruction) -> Tuple[List[str], List[Operand]]:
+    """Return the (defined names, used operands) of a TAC instruction."""
+    if isinstance(inst, (Assignment, BinaryOperation, UnaryOperation)):
+        return [inst.target], used_operands(inst)
+    return [], used_operands(inst)
+
+def allocate_registers(tac_instructions: List[TACInstruction]) -> Dict[str, str]:
+    """
+    Assign every temporary a register or a stack slot using linear scan.
+    Pass 1 computes the (first_def, last_use) interval of each temporary,
+    pass 2 walks the intervals by start point and hands out registers,
+    spilling the interval that ends furthest away when none are free.
+    Only compiler temporaries (intermediate.is_temp) are allocated: each is
+    defined and consumed within one statement, so a straight-line interval
+    is exact for it. User variables may be live across loop back-edges and
+    always stay in memory.
+    Returns a map from temporary name to register ("R3") or slot ("[FP-1]").
+    """
+    # Pass 1: live intervals
+    intervals: Dict[str, List[int]] = {}
+    for i, inst in enumerate(tac_instructions):
+        defs, uses = _instruction_operands(inst)
+        for operand in uses:
+            if isinstance(operand, VarRef) and operand.name in intervals:
+                intervals[operand.name][1] = i
+        for name in defs:
+            if is_temp(name) and name not in intervals:
+                intervals[name] = [i, i]
+
+    # Pass 2: linear scan
+    locations: Dict[str, str] = {}
+    free = list(range(len(ALLOCATABLE_REGISTERS)))  # already a valid heap
+    active: List[Tuple[int, str]] = []  # heap of (end, temp)
+    spill_slots = 0
+    for temp, (start, end) in sorted(intervals.items(), key=lambda item: item[1][0]):
+        # Expire intervals that ended before this one starts
+        while active and active[0][0] < start:
+            _, expired = heapq.heappop(active)
+            heapq.heappush(free, int(locations[expired][1:]))
+
+        if free:
+            locations[temp] = f"R{heapq.heappop(free)}"
+            heapq.heappush(active, (end, temp))
+            continue
+
+        # Spill whichever interval ends furthest away
+        spill_slots += 1
+        victim_end, victim = max(active)
+        if victim_end > end:
+            locations[temp] = locations[victim]
+            active.remove((victim_end, victim))
+            heapq.heapify(active)
+            heapq.heappush(active, (end, temp))
+            locations[victim] = f"[FP-{spill_slots}]"
+        else:
+            locations[temp] = f"[FP-{spill_slots}]"
+
+    return locations
+
 class AssemblyGenerator:
     """
     Generates assembly code for a hypothetical machine.
@@ -18,164 +95,191 @@ class AssemblyGenerator:
     - Basic arithmetic and comparison operations
     - Jump and conditional jump instructions
     - Load/store instructions for memory access
+    Temporaries live in registers R0-R5 (or stack slots when spilled);
+    R6 and R7 are scratch registers for variables and literals.
     """
     
-    def __init__(self):
+    def __init__(self) -> None:
         self.assembly_code: List[str] = []
-        self.register_pool = set(f"R{i}" for i in range(8))
-        self.used_registers = set()
-        self.label_map = {}  # Maps TAC labels to assembly labels
+        self._free = SCRATCH_MASK  # Bit i set means scratch register Ri is free
+        self.locations: Dict[str, str] = {}  # Maps temporaries to registers/stack slots
+        self._out = io.StringIO()
+        self._write = self._out.write
+        self._dispatch: Dict[type, Callable[[Any], None]] = {
+            Assignment: self._generate_assignment,
+            BinaryOperation: self._generate_binary_op,
+            UnaryOperation: self._generate_unary_op,
+            Print: self._generate_print,
+            Jump: self._generate_jump,
+            ConditionalJump: self._generate_conditional_jump,
+            Label: self._generate_label,
+        }
         
     def generate(self, tac_instructions: List[TACInstruction]) -> List[str]:
         """Generate assembly code from TAC instructions."""
-        # First pass: collect labels
-        for inst in tac_instructions:
-            if isinstance(inst, Label):
-                self.label_map[inst.name] = f"L{len(self.label_map)}"
+        self.locations = allocate_registers(tac_instructions)
         
-        # Second pass: generate code
+        dispatch = self._dispatch
+        free_scratch_registers = self._free_scratch_registers
         for inst in tac_instructions:
-            if isinstance(inst, Assignment):
-                self._generate_assignment(inst)
-            elif isinstance(inst, BinaryOperation):
-                self._generate_binary_op(inst)
-            elif isinstance(inst, UnaryOperation):
-                self._generate_unary_op(inst)
-            elif isinstance(inst, Print):
-                self._generate_print(inst)
-            elif isinstance(inst, Jump):
-                self._generate_jump(inst)
-            elif isinstance(inst, ConditionalJump):
-                self._generate_conditional_jump(inst)
-            elif isinstance(inst, Label):
-                self._generate_label(inst)
-                
+            dispatch[type(inst)](inst)
+            free_scratch_registers()
+            
+        self.assembly_code = self._peephole(self._out.getvalue().splitlines())
         return self.assembly_code
         
+    def _peephole(self, code: List[str]) -> List[str]:
+        """
+        Forward stored values to nearby reloads.
+        A "STORE Rx, m" followed within the same basic block by "LOAD Ry, m"
+        turns each such load into "MOV Ry, Rx" (or drops it when Ry is Rx), as long
+        as neither Rx nor m is overwritten in between. A store to a spill slot
+        that is only ever reloaded there is dropped as well.
+        """
+        slot_loads = Counter(
+            match.group(2) for match in map(_LOAD_RE.match, code)
+            if match and match.group(2).startswith('[')
+        )
+        lines: List[Optional[str]] = list(code)
+        for i, line in enumerate(lines):
+            store = _STORE_RE.match(line) if line else None
+            if not store:
+                continue
+            reg, location = store.groups()
+            for j in range(i + 1, min(i + 1 + PEEPHOLE_WINDOW, len(lines))):
+                other = lines[j]
+                if other is None:
+                    continue
+                load = _LOAD_RE.match(other)
+                if load and load.group(2) == location:
+                    target = load.group(1)
+                    lines[j] = None if target == reg else f"    MOV {target}, {reg}"
+                    if location.startswith('[') and slot_loads[location] == 1:
+                        lines[i] = None
+                    continue
+                # Labels and jumps end the basic block
+                if not other.startswith('    ') or other.startswith('    J'):
+                    break
+                write = _WRITES_REG_RE.match(other)
+                if write and write.group(1) == reg:
+                    break
+                overwrite = _STORE_RE.match(other)
+                if overwrite and overwrite.group(2) == location:
+                    break
+        return [line for line in lines if line is not None]
+        
     def _get_register(self) -> str:
-        """Get an available register."""
-        if not self.register_pool:
+        """Get the lowest-numbered available scratch register."""
+        if not self._free:
             raise RuntimeError("No available registers")
-        reg = self.register_pool.pop()
-        self.used_registers.add(reg)
+        i = (self._free & -self._free).bit_length() - 1
+        self._free ^= 1 << i
+        return REGISTER_NAMES[i]
+        
+    def _free_scratch_registers(self) -> None:
+        """Release every scratch register taken by the last instruction."""
+        self._free = SCRATCH_MASK
+            
+    def _emit_load(self, reg: str, operand: Operand, location: Optional[str] = None) -> None:
+        """Emit a LOAD of a constant (immediate) or a memory location into reg."""
+        if isinstance(operand, Const):
+            self._write("    LOAD %s, #%s\n" % (reg, operand.value))
+        else:
+            self._write("    LOAD %s, %s\n" % (reg, location or operand.name))
+            
+    def _load_operand(self, operand: Operand) -> str:
+        """Return a register holding the operand, loading it if necessary."""
+        location = None
+        if isinstance(operand, VarRef):
+            location = self.locations.get(operand.name)
+            if location is not None and location.startswith('R'):
+                return location
+            
+        # Constants are loaded as immediates, variables from memory and
+        # spilled temporaries from their stack slot
+        reg = self._get_register()
+        self._emit_load(reg, operand, location)
         return reg
         
-    def _free_register(self, reg: str) -> None:
-        """Free a register."""
-        if reg in self.used_registers:
-            self.used_registers.remove(reg)
-            self.register_pool.add(reg)
+    def _result_register(self, target: str) -> str:
+        """Return the register an instruction should write its result to."""
+        location = self.locations.get(target)
+        if location is not None and location.startswith('R'):
+            return location
+        taken = SCRATCH_MASK & ~self._free
+        if taken:
+            # Reuse a scratch register already holding an operand
+            return REGISTER_NAMES[(taken & -taken).bit_length() - 1]
+        return self._get_register()
+        
+    def _store_result(self, reg: str, target: str) -> None:
+        """Write a result back to memory unless its target lives in a register."""
+        location = self.locations.get(target, target)
+        if location != reg:
+            self._write("    STORE %s, %s\n" % (reg, location))
             
     def _generate_assignment(self, inst: Assignment) -> None:
         """Generate code for assignment."""
-        # Try to load the source value into a register
-        try:
-            # If source is a number, use immediate load
-            value = float(inst.source)
-            reg = self._get_register()
-            self.assembly_code.append(f"    LOAD {reg}, #{value}")
-        except ValueError:
-            # If source is a variable, load from memory
-            reg = self._get_register()
-            self.assembly_code.append(f"    LOAD {reg}, {inst.source}")
-            
-        # Store the value in the target variable
-        self.assembly_code.append(f"    STORE {reg}, {inst.target}")
-        self._free_register(reg)
+        reg = self._load_operand(inst.source)
+        location = self.locations.get(inst.target)
+        if location is not None and location.startswith('R'):
+            if location != reg:
+                self._write("    MOV %s, %s\n" % (location, reg))
+            return
+        self._store_result(reg, inst.target)
         
     def _generate_binary_op(self, inst: BinaryOperation) -> None:
         """Generate code for binary operation."""
         # Get registers for operands
-        left_reg = self._get_register()
-        right_reg = self._get_register()
-        result_reg = self._get_register()
-        
-        # Load operands
-        try:
-            left_val = float(inst.left)
-            self.assembly_code.append(f"    LOAD {left_reg}, #{left_val}")
-        except ValueError:
-            self.assembly_code.append(f"    LOAD {left_reg}, {inst.left}")
-            
-        try:
-            right_val = float(inst.right)
-            self.assembly_code.append(f"    LOAD {right_reg}, #{right_val}")
-        except ValueError:
-            self.assembly_code.append(f"    LOAD {right_reg}, {inst.right}")
+        left_reg = self._load_operand(inst.left)
+        right_reg = self._load_operand(inst.right)
+        result_reg = self._result_register(inst.target)
             
         # Generate operation
         if inst.operator == '+':
-            self.assembly_code.append(f"    ADD {result_reg}, {left_reg}, {right_reg}")
+            self._write("    ADD %s, %s, %s\n" % (result_reg, left_reg, right_reg))
         elif inst.operator == '-':
-            self.assembly_code.append(f"    SUB {result_reg}, {left_reg}, {right_reg}")
+            self._write("    SUB %s, %s, %s\n" % (result_reg, left_reg, right_reg))
         elif inst.operator == '*':
-            self.assembly_code.append(f"    MUL {result_reg}, {left_reg}, {right_reg}")
+            self._write("    MUL %s, %s, %s\n" % (result_reg, left_reg, right_reg))
         elif inst.operator == '/':
-            self.assembly_code.append(f"    DIV {result_reg}, {left_reg}, {right_reg}")
+            self._write("    DIV %s, %s, %s\n" % (result_reg, left_reg, right_reg))
         elif inst.operator in ['<', '<=', '>', '>=', '==', '!=']:
-            self.assembly_code.append(f"    CMP {left_reg}, {right_reg}")
-            self.assembly_code.append(f"    SET{inst.operator} {result_reg}")
+            self._write("    CMP %s, %s\n" % (left_reg, right_reg))
+            self._write("    SET%s %s\n" % (inst.operator, result_reg))
             
         # Store result
-        self.assembly_code.append(f"    STORE {result_reg}, {inst.target}")
-        
-        # Free registers
-        self._free_register(left_reg)
-        self._free_register(right_reg)
-        self._free_register(result_reg)
+        self._store_result(result_reg, inst.target)
         
     def _generate_unary_op(self, inst: UnaryOperation) -> None:
         """Generate code for unary operation."""
-        # Get registers
-        operand_reg = self._get_register()
-        result_reg = self._get_register()
-        
-        # Load operand
-        try:
-            operand_val = float(inst.operand)
-            self.assembly_code.append(f"    LOAD {operand_reg}, #{operand_val}")
-        except ValueError:
-            self.assembly_code.append(f"    LOAD {operand_reg}, {inst.operand}")
+        operand_reg = self._load_operand(inst.operand)
+        result_reg = self._result_register(inst.target)
             
         # Generate operation
         if inst.operator == '-':
-            self.assembly_code.append(f"    NEG {result_reg}, {operand_reg}")
+            self._write("    NEG %s, %s\n" % (result_reg, operand_reg))
         elif inst.operator == '+':
-            self.assembly_code.append(f"    MOV {result_reg}, {operand_reg}")
+            self._write("    MOV %s, %s\n" % (result_reg, operand_reg))
             
         # Store result
-        self.assembly_code.append(f"    STORE {result_reg}, {inst.target}")
-        
-        # Free registers
-        self._free_register(operand_reg)
-        self._free_register(result_reg)
+        self._store_result(result_reg, inst.target)
         
     def _generate_print(self, inst: Print) -> None:
         """Generate code for print statement."""
-        reg = self._get_register()
-        try:
-            value = float(inst.value)
-            self.assembly_code.append(f"    LOAD {reg}, #{value}")
-        except ValueError:
-            self.assembly_code.append(f"    LOAD {reg}, {inst.value}")
-        self.assembly_code.append(f"    PRINT {reg}")
-        self._free_register(reg)
+        reg = self._load_operand(inst.value)
+        self._write("    PRINT %s\n" % reg)
         
     def _generate_jump(self, inst: Jump) -> None:
         """Generate code for unconditional jump."""
-        self.assembly_code.append(f"    JMP {self.label_map[inst.target]}")
+        self._write("    JMP L%d\n" % inst.target)
         
     def _generate_conditional_jump(self, inst: ConditionalJump) -> None:
         """Generate code for conditional jump."""
-        reg = self._get_register()
-        try:
-            value = float(inst.condition)
-            self.assembly_code.append(f"    LOAD {reg}, #{value}")
-        except ValueError:
-            self.assembly_code.append(f"    LOAD {reg}, {inst.condition}")
-        self.assembly_code.append(f"    JZ {reg}, {self.label_map[inst.target]}")
-        self._free_register(reg)
+        reg = self._load_operand(inst.condition)
+        opcode = "JZ" if inst.negate else "JNZ"
+        self._write("    %s %s, L%d\n" % (opcode, reg, inst.target))
         
     def _generate_label(self, inst: Label) -> None:
         """Generate code for label."""
-        self.assembly_code.append(f"{self.label_map[inst.name]}:") 
\ No newline at end of file
+        self._write("L%d:\n" % inst.name) 
\ No newline at end of file
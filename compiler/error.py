@@ -3,17 +3,17 @@ Error handling module for the Mini Compiler.
 This module provides error reporting functionality for lexical, syntax, and semantic errors.
 """
 
+import bisect
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
-@dataclass
+@dataclass(slots=True, frozen=True, eq=False)
 class CompilerError:
     """Base class for compiler errors."""
     message: str
     line: int
     column: int
     error_type: str
-    source_line: Optional[str] = None
 
 class ErrorHandler:
     """
@@ -21,13 +21,29 @@ class ErrorHandler:
     """
     
     def __init__(self, source_code: str):
-        self.source_code = source_code.splitlines()
+        self._source = source_code
+        self._line_offsets: Optional[List[int]] = None  # Built on first use
         self.errors: List[CompilerError] = []
         
+    def source_line(self, line: int) -> Optional[str]:
+        """Return the text of a 1-based source line, or None if out of range."""
+        if self._line_offsets is None:
+            self._line_offsets = [0] + [i + 1 for i, c in enumerate(self._source) if c == '\n']
+        offsets = self._line_offsets
+        if not 0 < line <= len(offsets):
+            return None
+        end = offsets[line] - 1 if line < len(offsets) else len(self._source)
+        return self._source[offsets[line - 1]:end].rstrip('\r')
+        
     def add_error(self, message: str, line: int, column: int, error_type: str) -> None:
-        """Add an error to the collection."""
-        source_line = self.source_code[line - 1] if 0 < line <= len(self.source_code) else None
-        self.errors.append(CompilerError(message, line, column, error_type, source_line))
+        """Add an error to the collection, keeping it sorted by position."""
+        error = CompilerError(message, line, column, error_type)
+        
+        # Errors usually arrive in source order, so appending is the common case
+        if not self.errors or (line, column) >= (self.errors[-1].line, self.errors[-1].column):
+            self.errors.append(error)
+        else:
+            bisect.insort(self.errors, error, key=lambda e: (e.line, e.column))
         
     def has_errors(self) -> bool:
         """Check if there are any errors."""
@@ -38,18 +54,19 @@ class ErrorHandler:
         if not self.errors:
             return "No errors found."
             
-        report = []
-        for error in sorted(self.errors, key=lambda e: (e.line, e.column)):
-            report.append(f"{error.error_type} Error at line {error.line}, column {error.column}:")
-            report.append(f"  {error.message}")
-            
-            if error.source_line:
-                report.append(f"  {error.source_line}")
-                report.append("  " + " " * (error.column - 1) + "^")
-                
-            report.append("")
+        return "\n".join(line for error in self.errors for line in self._format_error(error))
+        
+    def _format_error(self, error: CompilerError) -> Iterator[str]:
+        """Yield the report lines for a single error."""
+        yield f"{error.error_type} Error at line {error.line}, column {error.column}:"
+        yield f"  {error.message}"
+        
+        source_line = self.source_line(error.line)
+        if source_line:
+            yield f"  {source_line}"
+            yield "  " + " " * (error.column - 1) + "^"
             
-        return "\n".join(report)
+        yield ""
 
 class ErrorReporter:
     """
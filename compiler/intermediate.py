@@ -3,67 +3,126 @@ Intermediate Code Generator for the Mini Compiler.
 This module generates Three-Address Code (TAC) from the AST.
 """
 
-from dataclasses import dataclass
-from typing import List, Union, Dict
+import operator
+from dataclasses import dataclass, replace
+from typing import List, Tuple, Union, Dict, final
 from .parser import (
     Node, Program, VarDeclaration, Statement, AssignmentStmt,
     IfStmt, WhileStmt, Expression, BinaryOp, UnaryOp, Literal,
     Identifier, PrintStmt
 )
 
-@dataclass
+@final
+@dataclass(slots=True, frozen=True)
+class Const:
+    """Literal operand"""
+    value: float
+
+    def __repr__(self) -> str:
+        return repr(self.value)
+
+@final
+@dataclass(slots=True, frozen=True)
+class VarRef:
+    """Variable or temporary operand"""
+    name: str
+
+    def __repr__(self) -> str:
+        return self.name
+
+Operand = Union[Const, VarRef]
+
+# Arithmetic operators that constant folding can evaluate at compile time
+FOLDABLE_OPERATORS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+}
+
+@dataclass(slots=True, frozen=True, eq=False)
 class TACInstruction:
     """Base class for TAC instructions."""
     pass
 
-@dataclass
+@final
+@dataclass(slots=True, frozen=True, eq=False)
 class Print(TACInstruction):
     """Print instruction: print value"""
-    value: str
+    value: Operand
 
-@dataclass
+@final
+@dataclass(slots=True, frozen=True, eq=False)
 class Assignment(TACInstruction):
     """Assignment instruction: target := source"""
     target: str
-    source: str
+    source: Operand
 
-@dataclass
+@final
+@dataclass(slots=True, frozen=True, eq=False)
 class BinaryOperation(TACInstruction):
     """Binary operation: target := left op right"""
     target: str
-    left: str
+    left: Operand
     operator: str
-    right: str
+    right: Operand
 
-@dataclass
+@final
+@dataclass(slots=True, frozen=True, eq=False)
 class UnaryOperation(TACInstruction):
     """Unary operation: target := op operand"""
     target: str
     operator: str
-    operand: str
+    operand: Operand
 
-@dataclass
+@final
+@dataclass(slots=True, frozen=True, eq=False)
 class Label(TACInstruction):
     """Label instruction for jumps"""
-    name: str
+    name: int
 
-@dataclass
+@final
+@dataclass(slots=True, frozen=True, eq=False)
 class Jump(TACInstruction):
     """Unconditional jump to label"""
-    target: str
+    target: int
 
-@dataclass
+@final
+@dataclass(slots=True, frozen=True, eq=False)
 class ConditionalJump(TACInstruction):
-    """Conditional jump: if condition goto target"""
-    condition: str
-    target: str
+    """Conditional jump: if condition goto target (if not condition, when negated)"""
+    condition: Operand
+    target: int
+    negate: bool = False
+
+# Temporaries are named TEMP_PREFIX + counter. '%' cannot start an
+# identifier, so a user variable can never be mistaken for a temporary
+TEMP_PREFIX = '%t'
+
+def is_temp(name: str) -> bool:
+    """Check if a name is a compiler-generated temporary."""
+    return name.startswith(TEMP_PREFIX)
+
+def used_operands(inst: TACInstruction) -> List[Operand]:
+    """Return the operands a TAC instruction reads."""
+    if isinstance(inst, BinaryOperation):
+        return [inst.left, inst.right]
+    if isinstance(inst, UnaryOperation):
+        return [inst.operand]
+    if isinstance(inst, Assignment):
+        return [inst.source]
+    if isinstance(inst, Print):
+        return [inst.value]
+    if isinstance(inst, ConditionalJump):
+        return [inst.condition]
+    return []
 
 class IntermediateCodeGenerator:
     """
     Generates Three-Address Code (TAC) from AST.
     """
     
-    def __init__(self):
+    def __init__(self) -> None:
         self.instructions: List[TACInstruction] = []
         self.temp_counter = 0
         self.label_counter = 0
@@ -83,13 +142,13 @@ class IntermediateCodeGenerator:
 
     def new_temp(self) -> str:
         """Generate a new temporary variable name."""
-        temp = f"t{self.temp_counter}"
+        temp = f"{TEMP_PREFIX}{self.temp_counter}"
         self.temp_counter += 1
         return temp
 
-    def new_label(self) -> str:
-        """Generate a new label name."""
-        label = f"L{self.label_counter}"
+    def new_label(self) -> int:
+        """Generate a new label ID."""
+        label = self.label_counter
         self.label_counter += 1
         return label
 
@@ -111,6 +170,17 @@ class IntermediateCodeGenerator:
     def visit_assignment(self, node: AssignmentStmt) -> None:
         """Process assignment statement."""
         expr_result = self.visit_expression(node.expression)
+        
+        # Coalesce "t := a op b; x := t" into "x := a op b"
+        last = self.instructions[-1] if self.instructions else None
+        if (isinstance(expr_result, VarRef) and
+                expr_result.name == f"{TEMP_PREFIX}{self.temp_counter - 1}" and
+                isinstance(last, (BinaryOperation, UnaryOperation)) and
+                last.target == expr_result.name):
+            self.instructions[-1] = replace(last, target=node.variable)
+            self.temp_counter -= 1  # The temporary is free for reuse
+            return
+            
         self.instructions.append(Assignment(node.variable, expr_result))
 
     def visit_if_statement(self, node: IfStmt) -> None:
@@ -121,7 +191,7 @@ class IntermediateCodeGenerator:
         end_label = self.new_label()
         
         # Jump to else block if condition is false
-        self.instructions.append(ConditionalJump(f"not {condition_result}", else_label))
+        self.instructions.append(ConditionalJump(condition_result, else_label, negate=True))
         
         # Then block
         for stmt in node.then_block:
@@ -135,7 +205,7 @@ class IntermediateCodeGenerator:
             
             # Evaluate elif condition
             elif_result = self.visit_expression(elif_condition)
-            self.instructions.append(ConditionalJump(f"not {elif_result}", else_label))
+            self.instructions.append(ConditionalJump(elif_result, else_label, negate=True))
             
             # Execute elif block
             for stmt in elif_statements:
@@ -160,7 +230,7 @@ class IntermediateCodeGenerator:
         
         # Condition
         condition_result = self.visit_expression(node.condition)
-        self.instructions.append(ConditionalJump(f"not {condition_result}", end_label))
+        self.instructions.append(ConditionalJump(condition_result, end_label, negate=True))
         
         # Loop body
         for stmt in node.body:
@@ -177,8 +247,8 @@ class IntermediateCodeGenerator:
         value = self.visit_expression(node.expression)
         self.instructions.append(Print(value))
 
-    def visit_expression(self, node: Expression) -> str:
-        """Process an expression node and return the result variable."""
+    def visit_expression(self, node: Expression) -> Operand:
+        """Process an expression node and return the result operand."""
         if isinstance(node, BinaryOp):
             return self.visit_binary_op(node)
         elif isinstance(node, UnaryOp):
@@ -190,7 +260,7 @@ class IntermediateCodeGenerator:
         else:
             raise ValueError(f"Unknown expression type: {type(node)}")
 
-    def visit_binary_op(self, node: BinaryOp) -> str:
+    def visit_binary_op(self, node: BinaryOp) -> VarRef:
         """Process binary operation and return result variable."""
         left_result = self.visit_expression(node.left)
         right_result = self.visit_expression(node.right)
@@ -199,9 +269,9 @@ class IntermediateCodeGenerator:
         self.instructions.append(
             BinaryOperation(result, left_result, node.operator.value, right_result)
         )
-        return result
+        return VarRef(result)
 
-    def visit_unary_op(self, node: UnaryOp) -> str:
+    def visit_unary_op(self, node: UnaryOp) -> VarRef:
         """Process unary operation and return result variable."""
         operand_result = self.visit_expression(node.operand)
         
@@ -209,15 +279,15 @@ class IntermediateCodeGenerator:
         self.instructions.append(
             UnaryOperation(result, node.operator.value, operand_result)
         )
-        return result
+        return VarRef(result)
 
-    def visit_literal(self, node: Literal) -> str:
-        """Process literal value and return its string representation."""
-        return str(node.value)
+    def visit_literal(self, node: Literal) -> Const:
+        """Process literal value and return it as a constant operand."""
+        return Const(float(node.value))
 
-    def visit_identifier(self, node: Identifier) -> str:
-        """Process identifier and return its name."""
-        return node.name
+    def visit_identifier(self, node: Identifier) -> VarRef:
+        """Process identifier and return a reference to it."""
+        return VarRef(node.name)
 
     def optimize(self) -> None:
         """
@@ -234,52 +304,44 @@ class IntermediateCodeGenerator:
 
     def _constant_folding(self) -> None:
         """Perform constant folding optimization."""
-        i = 0
-        while i < len(self.instructions):
-            inst = self.instructions[i]
+        # Partition the foldable binary operations by operator in one pass,
+        # keeping each one's position, target and constant operand values
+        foldable: Dict[str, List[Tuple[int, str, float, float]]] = {op: [] for op in FOLDABLE_OPERATORS}
+        for i, inst in enumerate(self.instructions):
+            if (isinstance(inst, BinaryOperation) and inst.operator in foldable and
+                    isinstance(inst.left, Const) and isinstance(inst.right, Const)):
+                if inst.operator == '/' and inst.right.value == 0:
+                    continue  # Avoid division by zero
+                foldable[inst.operator].append((i, inst.target, inst.left.value, inst.right.value))
+                
+        # Evaluate each partition with a single map() over the operator
+        instructions = self.instructions
+        for op, entries in foldable.items():
+            results = map(FOLDABLE_OPERATORS[op],
+                          [left for _, _, left, _ in entries],
+                          [right for _, _, _, right in entries])
             
-            if isinstance(inst, BinaryOperation):
-                try:
-                    # Try to evaluate constant expressions
-                    left = float(inst.left) if '.' in inst.left else int(inst.left)
-                    right = float(inst.right) if '.' in inst.right else int(inst.right)
-                    
-                    result = None
-                    if inst.operator == '+':
-                        result = left + right
-                    elif inst.operator == '-':
-                        result = left - right
-                    elif inst.operator == '*':
-                        result = left * right
-                    elif inst.operator == '/':
-                        if right != 0:  # Avoid division by zero
-                            result = left / right
-                            
-                    if result is not None:
-                        # Replace the binary operation with a simple assignment
-                        self.instructions[i] = Assignment(inst.target, str(result))
-                except (ValueError, ZeroDivisionError):
-                    pass
-                    
-            i += 1
+            # Replace the binary operations with simple assignments
+            for (i, target, _, _), result in zip(entries, results):
+                instructions[i] = Assignment(target, Const(result))
 
     def _dead_code_elimination(self) -> None:
-        """Perform dead code elimination optimization."""
-        # Find all variables that are used
-        used_vars = set()
-        for inst in self.instructions:
-            if isinstance(inst, Assignment):
-                if inst.target.startswith('t'):  # Only consider temporaries
+        """
+        Perform dead code elimination optimization.
+        Walks the code backwards tracking which names are read later on and
+        drops instructions whose temporary result is never read. Temporaries
+        never live across basic blocks, so a single backward pass is exact for
+        them; assignments to program variables are always kept.
+        """
+        live = set()
+        kept = []
+        for inst in reversed(self.instructions):
+            if isinstance(inst, (Assignment, BinaryOperation, UnaryOperation)):
+                if is_temp(inst.target) and inst.target not in live:
                     continue
-                used_vars.add(inst.target)
-            elif isinstance(inst, (BinaryOperation, UnaryOperation)):
-                if not inst.target.startswith('t'):
-                    used_vars.add(inst.target)
-                    
-        # Remove assignments to unused temporary variables
-        self.instructions = [
-            inst for inst in self.instructions
-            if not (isinstance(inst, (Assignment, BinaryOperation, UnaryOperation)) and
-                   inst.target.startswith('t') and
-                   inst.target not in used_vars)
-        ] 
\ No newline at end of file
+                live.discard(inst.target)
+            for operand in used_operands(inst):
+                if isinstance(operand, VarRef):
+                    live.add(operand.name)
+            kept.append(inst)
+        self.instructions = kept[::-1]
\ No newline at end of file
@@ -1,108 +1,181 @@
 # Interpreter for the Mini Compiler.
 # This module executes the generated Three-Address Code (TAC).
+# Before running, the TAC is lowered to a list of closures ("thunks") that
+# capture their operands and operator callables, so the execution loop does
+# no per-instruction type dispatch or operand decoding.
 
-from typing import Dict, List
-from .intermediate import TACInstruction, Assignment, BinaryOperation, UnaryOperation, Print, Jump, ConditionalJump, Label
+import operator
+from array import array
+from typing import Any, Callable, Dict, Iterator, List
+from .intermediate import TACInstruction, Assignment, BinaryOperation, UnaryOperation, Print, Jump, ConditionalJump, Label, Const, VarRef, Operand, is_temp, used_operands
+
+# A compiled instruction takes the current program counter and returns the next one.
+Thunk = Callable[[int], int]
+
+# Yield every variable/temporary name an instruction reads or writes.
+def _instruction_names(inst: TACInstruction) -> Iterator[str]:
+    if isinstance(inst, (Assignment, BinaryOperation, UnaryOperation)):
+        yield inst.target
+    for operand in used_operands(inst):
+        if isinstance(operand, VarRef):
+            yield operand.name
 
 class Interpreter:
     # Interpreter that executes Three-Address Code (TAC).
-    
-    def __init__(self):
+
+    def __init__(self) -> None:
         self.variables: Dict[str, float] = {}
         self.temporaries: Dict[str, float] = {}
-        self.labels: Dict[str, int] = {}
+        self.labels: List[int] = []  # Maps label IDs to instruction indices
         self.current_instruction = 0
-        
+        self._slots: Dict[str, int] = {}  # Maps names to indices into _memory
+        self._memory = array('d')
+        self._binops = {
+            '+': operator.add,
+            '-': operator.sub,
+            '*': operator.mul,
+            '/': lambda a, b: a / b if b != 0 else 0,
+            '<=': lambda a, b: float(a <= b),
+            '>=': lambda a, b: float(a >= b),
+            '<': lambda a, b: float(a < b),
+            '>': lambda a, b: float(a > b),
+            '==': lambda a, b: float(a == b),
+            '!=': lambda a, b: float(a != b),
+        }
+        self._unops = {
+            '+': lambda x: x,
+            '-': operator.neg,
+        }
+        self._compilers: Dict[type, Callable[[Any], Thunk]] = {
+            Assignment: self._compile_assignment,
+            BinaryOperation: self._compile_binary_operation,
+            UnaryOperation: self._compile_unary_operation,
+            Print: self._compile_print,
+            Jump: self._compile_jump,
+            ConditionalJump: self._compile_conditional_jump,
+            Label: self._compile_label,
+        }
+
     # Execute the intermediate code.
     def execute(self, instructions: List[TACInstruction]) -> None:
-        # First pass: collect label positions
-        for i, inst in enumerate(instructions):
-            if isinstance(inst, Label):
-                self.labels[inst.name] = i
-        
-        # Second pass: execute instructions
-        while self.current_instruction < len(instructions):
-            inst = instructions[self.current_instruction]
-            self._execute_instruction(inst)
-            self.current_instruction += 1
-            
-    # Execute a single instruction.
-    def _execute_instruction(self, inst: TACInstruction) -> None:
-        if isinstance(inst, Assignment):
-            value = self._get_value(inst.source)
-            self._set_value(inst.target, value)
-            
-        elif isinstance(inst, BinaryOperation):
-            left = self._get_value(inst.left)
-            right = self._get_value(inst.right)
-            result = self._apply_operator(left, inst.operator, right)
-            self._set_value(inst.target, result)
-            
-        elif isinstance(inst, UnaryOperation):
-            operand = self._get_value(inst.operand)
-            result = self._apply_unary_operator(inst.operator, operand)
-            self._set_value(inst.target, result)
-            
-        elif isinstance(inst, Print):
-            value = self._get_value(inst.value)
-            print(f"Output: {value}")
-            
-        elif isinstance(inst, Jump):
-            self.current_instruction = self.labels[inst.target] - 1
-            
-        elif isinstance(inst, ConditionalJump):
-            condition = inst.condition.startswith('not ')
-            value = self._get_value(inst.condition[4:] if condition else inst.condition)
-            if condition != bool(value):
-                self.current_instruction = self.labels[inst.target] - 1
-                
-    # Get value of a variable or literal.
-    def _get_value(self, name: str) -> float:
-        try:
-            return float(name)  # Try to convert to number
-        except ValueError:
-            if name in self.variables:
-                return self.variables[name]
-            elif name in self.temporaries:
-                return self.temporaries[name]
+        self._intern_names(instructions)
+        thunks = self._compile(instructions)
+
+        pc = self.current_instruction
+        end = len(thunks)
+        while pc < end:
+            pc = thunks[pc](pc)
+        self.current_instruction = pc
+
+        # Publish final values back to the name-keyed dicts
+        for name, slot in self._slots.items():
+            self._storage(name)[name] = self._memory[slot]
+
+    # Give every variable and temporary a slot in one flat float array.
+    def _intern_names(self, instructions: List[TACInstruction]) -> None:
+        self._slots = {}
+        for inst in instructions:
+            for name in _instruction_names(inst):
+                if name not in self._slots:
+                    self._slots[name] = len(self._slots)
+        self._memory = array('d', (self._storage(name).get(name, 0.0) for name in self._slots))
+
+    # Lower the instructions to thunks, resolving labels to instruction indices.
+    def _compile(self, instructions: List[TACInstruction]) -> List[Thunk]:
+        label_positions = [(inst.name, i) for i, inst in enumerate(instructions)
+                           if isinstance(inst, Label)]
+        self.labels = [0] * (max((name for name, _ in label_positions), default=-1) + 1)
+        for name, i in label_positions:
+            self.labels[name] = i
+        return [self._compilers[type(inst)](inst) for inst in instructions]
+
+    # Storage dict a name is published to after execution.
+    def _storage(self, name: str) -> Dict[str, float]:
+        return self.temporaries if is_temp(name) else self.variables
+
+    # Build a zero-argument reader for an operand.
+    def _reader(self, operand: Operand) -> Callable[[], float]:
+        if isinstance(operand, Const):
+            value = operand.value
+            return lambda: value
+        memory, slot = self._memory, self._slots[operand.name]
+        return lambda: memory[slot]
+
+    def _compile_assignment(self, inst: Assignment) -> Thunk:
+        memory, target = self._memory, self._slots[inst.target]
+        if isinstance(inst.source, Const):
+            value = inst.source.value
+            def run(pc: int) -> int:
+                memory[target] = value
+                return pc + 1
+        else:
+            source = self._slots[inst.source.name]
+            def run(pc: int) -> int:
+                memory[target] = memory[source]
+                return pc + 1
+        return run
+
+    def _compile_binary_operation(self, inst: BinaryOperation) -> Thunk:
+        memory, target = self._memory, self._slots[inst.target]
+        op = self._binops.get(inst.operator, lambda a, b: 0.0)
+        left, right = inst.left, inst.right
+
+        # Specialize on operand kinds so constants are captured directly
+        if isinstance(left, Const):
+            if isinstance(right, Const):
+                value = op(left.value, right.value)
+                def run(pc: int) -> int:
+                    memory[target] = value
+                    return pc + 1
             else:
-                return 0.0  # Default value for undefined variables
-            
-    # Set value of a variable or temporary.
-    def _set_value(self, name: str, value: float) -> None:
-        if name.startswith('t'):
-            self.temporaries[name] = value
+                left_value, right_slot = left.value, self._slots[right.name]
+                def run(pc: int) -> int:
+                    memory[target] = op(left_value, memory[right_slot])
+                    return pc + 1
+        elif isinstance(right, Const):
+            left_slot, right_value = self._slots[left.name], right.value
+            def run(pc: int) -> int:
+                memory[target] = op(memory[left_slot], right_value)
+                return pc + 1
         else:
-            self.variables[name] = value
-            
-    # Apply binary operator.
-    def _apply_operator(self, left: float, operator: str, right: float) -> float:
-        if operator == '+':
-            return left + right
-        elif operator == '-':
-            return left - right
-        elif operator == '*':
-            return left * right
-        elif operator == '/':
-            return left / right if right != 0 else 0
-        elif operator == '<=':
-            return float(left <= right)
-        elif operator == '>=':
-            return float(left >= right)
-        elif operator == '<':
-            return float(left < right)
-        elif operator == '>':
-            return float(left > right)
-        elif operator == '==':
-            return float(left == right)
-        elif operator == '!=':
-            return float(left != right)
-        return 0.0
-        
-    # Apply unary operator.
-    def _apply_unary_operator(self, operator: str, operand: float) -> float:
-        if operator == '+':
-            return operand
-        elif operator == '-':
-            return -operand
-        return 0.0 
\ No newline at end of file
+            left_slot, right_slot = self._slots[left.name], self._slots[right.name]
+            def run(pc: int) -> int:
+                memory[target] = op(memory[left_slot], memory[right_slot])
+                return pc + 1
+        return run
+
+    def _compile_unary_operation(self, inst: UnaryOperation) -> Thunk:
+        memory, target = self._memory, self._slots[inst.target]
+        op = self._unops.get(inst.operator, lambda x: 0.0)
+        read = self._reader(inst.operand)
+        def run(pc: int) -> int:
+            memory[target] = op(read())
+            return pc + 1
+        return run
+
+    def _compile_print(self, inst: Print) -> Thunk:
+        read = self._reader(inst.value)
+        def run(pc: int) -> int:
+            print(f"Output: {read()}")
+            return pc + 1
+        return run
+
+    def _compile_jump(self, inst: Jump) -> Thunk:
+        target = self.labels[inst.target]
+        return lambda pc: target
+
+    def _compile_conditional_jump(self, inst: ConditionalJump) -> Thunk:
+        negate = inst.negate
+        target = self.labels[inst.target]
+        if isinstance(inst.condition, Const):
+            taken = negate ^ bool(inst.condition.value)
+            return lambda pc: target if taken else pc + 1
+        memory, slot = self._memory, self._slots[inst.condition.name]
+        def run(pc: int) -> int:
+            if negate ^ bool(memory[slot]):
+                return target
+            return pc + 1
+        return run
+
+    def _compile_label(self, inst: Label) -> Thunk:
+        return lambda pc: pc + 1
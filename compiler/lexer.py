@@ -4,10 +4,18 @@ This module handles tokenization of the input source code.
 """
 
 import re
-from enum import Enum, auto
-from typing import List, NamedTuple, Optional
+import sys
+from bisect import bisect_right
+from dataclasses import dataclass
+from enum import Enum, IntEnum, auto
+from typing import Dict, List, Tuple
+
+class TokenType(IntEnum):
+    # Integer-valued so the parser can keep token types in a flat array;
+    # still printed as TokenType.NAME in tokens and error messages
+    __str__ = Enum.__str__
+    __format__ = Enum.__format__
 
-class TokenType(Enum):
     # Keywords
     PROGRAM = auto()
     VAR = auto()
@@ -46,7 +54,8 @@ class TokenType(Enum):
     FLOAT_LITERAL = auto()
     EOF = auto()
 
-class Token(NamedTuple):
+@dataclass(slots=True, frozen=True)
+class Token:
     type: TokenType
     value: str
     line: int
@@ -62,17 +71,45 @@ class LexicalError(Exception):
         self.line = line
         self.column = column
 
+# Master token pattern: skips any leading whitespace/comments, then matches
+# one token with a named alternative per token class, or the end of input
+# so that trailing comments are never backtracked into. Each whitespace run
+# is a single \s* repeat, leaving the engine no nested alternation to retry.
+# Two-character operators come before their one-character prefixes.
+# Character classes are compiled by the regex engine into charset/bitmap
+# tests, so no per-character classification happens in Python.
+MASTER = re.compile(r"""
+    \s*(?:\#[^\n]*\s*)*
+    (?:
+    (?P<ID>[^\W\d]\w*)
+  | (?P<NUMBER>\d[\d.]*)
+  | (?P<OP2>==|!=|<=|>=)
+  | (?P<OP1>[-+*/=<>(){};])
+  | (?P<MISMATCH>\S)
+  | (?P<END>\Z)
+    )
+""", re.VERBOSE | re.DOTALL)
+# Group numbers of the token alternatives; the tokenizer dispatches on
+# Match.lastindex so each token costs integer compares, not string ones
+_ID, _NUMBER, _OP2, _OP1, _MISMATCH, _END = (
+    MASTER.groupindex[name] for name in ('ID', 'NUMBER', 'OP2', 'OP1', 'MISMATCH', 'END')
+)
+
 class Lexer:
     """
     Lexical Analyzer that converts source code into tokens.
     """
     
-    def __init__(self, source_code: str):
+    def __init__(self, source_code: str, debug: bool = False):
         self.source_code = source_code
-        self.position = 0
-        self.line = 1
-        self.column = 1
-        self.current_char = self.source_code[0] if source_code else None
+        self.debug = debug
+        # Offset at which each line starts, for computing token line/column
+        self._line_starts = [0]
+        find = source_code.find
+        nl = find('\n')
+        while nl >= 0:
+            self._line_starts.append(nl + 1)
+            nl = find('\n', nl + 1)
         
         # Define token patterns
         self.keywords = {
@@ -85,15 +122,28 @@ class Lexer:
             'patapim': TokenType.WHILE,
             'drip': TokenType.PRINT,
         }
+        # Keywords indexed by length and then first character, a shallow
+        # prefix tree: identifiers that diverge from every keyword there are
+        # classified without lowercasing or hashing the whole name
+        self._kw_by_len: Dict[int, Dict[str, Dict[str, TokenType]]] = {}
+        for word, token_type in self.keywords.items():
+            by_first = self._kw_by_len.setdefault(len(word), {})
+            by_first.setdefault(word[0], {})[word] = token_type
         
-        self.operators = {
+        # Two-character operators are matched by the OP2 group and
+        # single-character ones by OP1, so each gets its own table
+        self._op2 = {
+            '==': TokenType.EQUALS,
+            '!=': TokenType.NOT_EQUALS,
+            '<=': TokenType.LESS_THAN_OR_EQUAL,
+            '>=': TokenType.GREATER_THAN_OR_EQUAL,
+        }
+        self._op1 = {
             '+': TokenType.PLUS,
             '-': TokenType.MINUS,
             '*': TokenType.MULTIPLY,
             '/': TokenType.DIVIDE,
             '=': TokenType.ASSIGN,
-            '==': TokenType.EQUALS,
-            '!=': TokenType.NOT_EQUALS,
             '<': TokenType.LESS_THAN,
             '>': TokenType.GREATER_THAN,
             '(': TokenType.LPAREN,
@@ -101,154 +151,95 @@ class Lexer:
             '{': TokenType.LBRACE,
             '}': TokenType.RBRACE,
             ';': TokenType.SEMICOLON,
-            '<=': TokenType.LESS_THAN_OR_EQUAL,
-            '>=': TokenType.GREATER_THAN_OR_EQUAL,
         }
 
-    def advance(self):
-        """Move to the next character in the source code."""
-        self.position += 1
-        self.column += 1
-        
-        if self.position >= len(self.source_code):
-            self.current_char = None
-        else:
-            if self.current_char == '\n':
-                self.line += 1
-                self.column = 1
-            self.current_char = self.source_code[self.position]
-
-    def peek(self) -> Optional[str]:
-        """Look at the next character without consuming it."""
-        peek_pos = self.position + 1
-        if peek_pos >= len(self.source_code):
-            return None
-        return self.source_code[peek_pos]
-
-    def skip_whitespace(self):
-        """Skip whitespace characters."""
-        while self.current_char and self.current_char.isspace():
-            self.advance()
-
-    def skip_comment(self):
-        """Skip single-line comments."""
-        # Skip the '#' character
-        self.advance()
-        
-        # Continue until end of line or end of file
-        while self.current_char and self.current_char != '\n':
-            self.advance()
-        if self.current_char == '\n':
-            self.advance()
-
-    def read_identifier(self) -> Token:
-        """Read an identifier or keyword."""
-        result = ''
-        column_start = self.column
-        
-        while self.current_char and (self.current_char.isalnum() or self.current_char == '_'):
-            result += self.current_char
-            self.advance()
-
-        # Check if it's a keyword
-        token_type = self.keywords.get(result.lower(), TokenType.IDENTIFIER)
-        token = Token(token_type, result, self.line, column_start)
-        print(f"Found identifier/keyword: {token}")
-        return token
-
-    def read_number(self) -> Token:
-        """Read a number (integer or float)."""
-        result = ''
-        column_start = self.column
-        is_float = False
-        
-        while self.current_char and (self.current_char.isdigit() or self.current_char == '.'):
-            if self.current_char == '.':
-                if is_float:
-                    raise LexicalError(
-                        "Invalid number format: multiple decimal points",
-                        self.line,
-                        self.column
-                    )
-                is_float = True
-            result += self.current_char
-            self.advance()
-
-        token = Token(
-            TokenType.FLOAT_LITERAL if is_float else TokenType.INTEGER_LITERAL,
-            result,
-            self.line,
-            column_start
-        )
-        print(f"Found number: {token}")
-        return token
-
-    def get_next_token(self) -> Token:
-        """
-        Get the next token from the source code.
-        Returns Token object containing the token type and value.
-        """
-        while self.current_char:
-            # Skip whitespace
-            if self.current_char.isspace():
-                self.skip_whitespace()
-                continue
-
-            # Skip comments
-            if self.current_char == '#':
-                print(f"Found comment at line {self.line}")
-                self.skip_comment()
-                continue
-
-            # Identifiers and keywords
-            if self.current_char.isalpha() or self.current_char == '_':
-                return self.read_identifier()
-
-            # Numbers
-            if self.current_char.isdigit():
-                return self.read_number()
+    def _loc(self, pos: int) -> Tuple[int, int]:
+        """Convert a source offset into a 1-based (line, column) pair."""
+        line = bisect_right(self._line_starts, pos)
+        return line, pos - self._line_starts[line - 1] + 1
 
-            # Multi-character operators
-            next_char = self.peek() or ''
-            two_char = self.current_char + next_char
-            if two_char in self.operators:
-                operator = two_char
-                token = Token(self.operators[operator], operator, self.line, self.column)
-                self.advance()
-                self.advance()
-                print(f"Found operator: {token}")
-                return token
-
-            # Single-character operators
-            if self.current_char in self.operators:
-                token = Token(self.operators[self.current_char], self.current_char, self.line, self.column)
-                self.advance()
-                print(f"Found operator: {token}")
-                return token
-
-            # Invalid character
-            raise LexicalError(
-                f"Invalid character '{self.current_char}'",
-                self.line,
-                self.column
-            )
-
-        # End of file
-        token = Token(TokenType.EOF, '', self.line, self.column)
-        print(f"Found EOF: {token}")
-        return token
-
-    def tokenize(self) -> List[Token]:
+    def tokenize(self) -> Tuple[Token, ...]:
         """
         Convert the entire source code into a list of tokens.
-        Returns a list of Token objects.
+        Returns a tuple of Token objects.
         """
         print("\nStarting tokenization...")
-        tokens = []
-        while True:
-            token = self.get_next_token()
-            tokens.append(token)
-            if token.type == TokenType.EOF:
+        tokens: List[Token] = []
+        append = tokens.append
+        source: str = self.source_code
+        # Tokens arrive in source order, so the current line only ever moves
+        # forward and no per-token search is needed
+        line_starts = self._line_starts
+        line_count: int = len(line_starts)
+        line: int = 1
+        kw_by_len = self._kw_by_len
+        op1, op2 = self._op1, self._op2
+        intern = sys.intern
+        for m in MASTER.finditer(source):
+            kind = m.lastindex
+            # Every alternative of MASTER is a named group, so one always matched
+            assert kind is not None
+            start = m.start(kind)
+            if self.debug:
+                # Each comment runs to the end of its line
+                pos = source.find('#', m.start(), start)
+                while pos >= 0:
+                    print(f"Found comment at line {self._loc(pos)[0]}")
+                    nl = source.find('\n', pos, start)
+                    pos = source.find('#', nl, start) if nl >= 0 else -1
+            if kind == _END:
                 break
+            
+            # Whitespace and comments are never materialized; the token text
+            # is a single slice of the source
+            value = source[start:m.end()]
+            while line < line_count and line_starts[line] <= start:
+                line += 1
+            column = start - line_starts[line - 1] + 1
+            if kind == _ID:
+                # Names become symbol-table keys later, so intern them once
+                value = intern(value)
+                # Check if it's a keyword
+                token_type = TokenType.IDENTIFIER
+                by_first = kw_by_len.get(len(value))
+                if by_first:
+                    bucket = by_first.get(value[0].lower())
+                    if bucket:
+                        token_type = bucket.get(value.lower(), TokenType.IDENTIFIER)
+                token = Token(token_type, value, line, column)
+                if self.debug:
+                    print(f"Found identifier/keyword: {token}")
+            elif kind == _NUMBER:
+                dots = value.count('.')
+                if dots > 1:
+                    raise LexicalError(
+                        "Invalid number format: multiple decimal points",
+                        line,
+                        column + value.index('.', value.index('.') + 1)
+                    )
+                token = Token(
+                    TokenType.FLOAT_LITERAL if dots else TokenType.INTEGER_LITERAL,
+                    value,
+                    line,
+                    column
+                )
+                if self.debug:
+                    print(f"Found number: {token}")
+            elif kind == _MISMATCH:
+                raise LexicalError(f"Invalid character '{value}'", line, column)
+            else:
+                value = intern(value)
+                token_type = op1[value] if kind == _OP1 else op2[value]
+                token = Token(token_type, value, line, column)
+                if self.debug:
+                    print(f"Found operator: {token}")
+            append(token)
+
+        # End of file
+        line, column = self._loc(len(source))
+        token = Token(TokenType.EOF, '', line, column)
+        if self.debug:
+            print(f"Found EOF: {token}")
+        append(token)
         print(f"\nTokenization complete. Found {len(tokens)} tokens.")
-        return tokens 
\ No newline at end of file
+        return tuple(tokens) 
\ No newline at end of file
@@ -9,7 +9,7 @@ from typing import List, Optional
 from .lexer import Lexer, LexicalError, Token, TokenType
 from .parser import Parser, ParseError
 from .semantic import SemanticAnalyzer, SemanticError
-from .intermediate import IntermediateCodeGenerator, TACInstruction
+from .intermediate import IntermediateCodeGenerator, TACInstruction, Label
 from .codegen import AssemblyGenerator
 from .interpreter import Interpreter
 from .error import ErrorHandler, ErrorReporter
@@ -19,8 +19,9 @@ class Compiler:
     Main compiler class that coordinates all compilation phases.
     """
     
-    def __init__(self, source_code: str):
+    def __init__(self, source_code: str, verbose: bool = False):
         self.source_code = source_code
+        self.verbose = verbose
         self.error_handler = ErrorHandler(source_code)
         
     def compile(self) -> Optional[tuple[List[TACInstruction], List[str]]]:
@@ -31,16 +32,17 @@ class Compiler:
         try:
             print("\nStarting lexical analysis...")
             # Lexical Analysis
-            lexer = Lexer(self.source_code)
+            lexer = Lexer(self.source_code, debug=self.verbose)
             tokens = lexer.tokenize()
-            print(f"Found {len(tokens)} tokens")
-            print("\nTokens:")
-            for token in tokens:
-                print(f"  {token}")
+            if self.verbose:
+                print(f"Found {len(tokens)} tokens")
+                print("\nTokens:")
+                for token in tokens:
+                    print(f"  {token}")
             
             print("\nStarting syntax analysis...")
             # Syntax Analysis
-            parser = Parser(tokens)
+            parser = Parser(tokens, debug=self.verbose)
             ast = parser.parse()
             print("AST generated successfully")
             
@@ -58,6 +60,7 @@ class Compiler:
             print("\nOptimizing code...")
             # Optimization
             generator.optimize()
+            intermediate_code = generator.instructions
             print("Optimization completed")
             
             print("\nGenerating assembly code...")
@@ -98,8 +101,8 @@ def format_tac(instructions: List[TACInstruction]) -> str:
     """Format TAC instructions for output."""
     lines = []
     for i, inst in enumerate(instructions):
-        if hasattr(inst, 'name'):  # Label
-            lines.append(f"{inst.name}:")
+        if isinstance(inst, Label):
+            lines.append(f"L{inst.name}:")
         else:
             lines.append(f"{i:4d}: {str(inst)}")
     return "\n".join(lines)
@@ -110,13 +113,16 @@ def format_asm(instructions: List[str]) -> str:
 
 def main() -> None:
     """Main entry point for the compiler."""
-    if len(sys.argv) != 2:
-        print("Usage: python -m compiler.main <source_file>")
+    args = sys.argv[1:]
+    verbose = '-v' in args or '--verbose' in args
+    args = [arg for arg in args if arg not in ('-v', '--verbose')]
+    if len(args) != 1:
+        print("Usage: python -m compiler.main [-v|--verbose] <source_file>")
         sys.exit(1)
         
     try:
-        print(f"Reading source file: {sys.argv[1]}")
-        with open(sys.argv[1], 'r') as f:
+        print(f"Reading source file: {args[0]}")
+        with open(args[0], 'r') as f:
             source_code = f.read()
         print(f"Source code length: {len(source_code)} characters")
         print("\nSource code:")
@@ -127,7 +133,7 @@ def main() -> None:
         print(f"Error reading source file: {e}")
         sys.exit(1)
         
-    compiler = Compiler(source_code)
+    compiler = Compiler(source_code, verbose=verbose)
     result = compiler.compile()
     
     if compiler.error_handler.has_errors():
@@ -3,8 +3,9 @@ Syntax Analyzer (Parser) for the Mini Compiler.
 This module implements an LL(1) parser to create an Abstract Syntax Tree (AST).
 """
 
+from array import array
 from dataclasses import dataclass
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 from .lexer import Token, TokenType, LexicalError
 
 class ParseError(Exception):
@@ -15,18 +16,18 @@ class ParseError(Exception):
         self.column = column
 
 # AST Node classes
-@dataclass
+@dataclass(slots=True)
 class Node:
     """Base class for all AST nodes."""
     pass
 
-@dataclass
+@dataclass(slots=True)
 class Program(Node):
     """Root node of the program."""
     declarations: List['VarDeclaration']
     statements: List['Statement']
 
-@dataclass
+@dataclass(slots=True)
 class VarDeclaration(Node):
     """Variable declaration node."""
     name: str
@@ -34,12 +35,12 @@ class VarDeclaration(Node):
     line: int
     column: int
 
-@dataclass
+@dataclass(slots=True)
 class Statement(Node):
     """Base class for all statement nodes."""
     pass
 
-@dataclass
+@dataclass(slots=True)
 class AssignmentStmt(Statement):
     """Assignment statement node."""
     variable: str
@@ -47,7 +48,7 @@ class AssignmentStmt(Statement):
     line: int
     column: int
 
-@dataclass
+@dataclass(slots=True)
 class IfStmt(Statement):
     """If statement node."""
     condition: 'Expression'
@@ -57,7 +58,7 @@ class IfStmt(Statement):
     line: int
     column: int
 
-@dataclass
+@dataclass(slots=True)
 class WhileStmt(Statement):
     """While loop statement node."""
     condition: 'Expression'
@@ -65,19 +66,19 @@ class WhileStmt(Statement):
     line: int
     column: int
 
-@dataclass
+@dataclass(slots=True)
 class Expression(Node):
     """Base class for all expression nodes."""
     pass
 
-@dataclass
+@dataclass(slots=True)
 class PrintStmt(Statement):
     """Print statement node."""
     expression: Expression
     line: int
     column: int
 
-@dataclass
+@dataclass(slots=True)
 class BinaryOp(Expression):
     """Binary operation node."""
     left: Expression
@@ -86,7 +87,7 @@ class BinaryOp(Expression):
     line: int
     column: int
 
-@dataclass
+@dataclass(slots=True)
 class UnaryOp(Expression):
     """Unary operation node."""
     operator: Token
@@ -94,42 +95,75 @@ class UnaryOp(Expression):
     line: int
     column: int
 
-@dataclass
+@dataclass(slots=True)
 class Literal(Expression):
     """Literal value node."""
     value: Union[int, float]
     line: int
     column: int
+    type_name: str  # Type of the literal, fixed by its token at parse time
 
-@dataclass
+@dataclass(slots=True)
 class Identifier(Expression):
     """Variable reference node."""
     name: str
     line: int
     column: int
 
+# Binary operator precedence; higher binds tighter. All levels are left-associative.
+_PREC: Dict[int, int] = {
+    TokenType.EQUALS: 1,
+    TokenType.NOT_EQUALS: 1,
+    TokenType.LESS_THAN: 1,
+    TokenType.GREATER_THAN: 1,
+    TokenType.LESS_THAN_OR_EQUAL: 1,
+    TokenType.GREATER_THAN_OR_EQUAL: 1,
+    TokenType.PLUS: 2,
+    TokenType.MINUS: 2,
+    TokenType.MULTIPLY: 3,
+    TokenType.DIVIDE: 3,
+}
+_LITERALS = frozenset({TokenType.INTEGER_LITERAL, TokenType.FLOAT_LITERAL})
+_UNARY_OPS = frozenset({TokenType.PLUS, TokenType.MINUS})
+
 class Parser:
     """
     LL(1) Parser that generates an Abstract Syntax Tree.
     """
     
-    def __init__(self, tokens: List[Token]):
-        self.tokens = tokens
+    def __init__(self, tokens: Sequence[Token], debug: bool = False):
+        # The stream is always terminated by an EOF token, which acts as a
+        # sentinel: no parsing loop consumes it, so reads never run past it
+        if not tokens or tokens[-1].type != TokenType.EOF:
+            tokens = (*tokens, Token(TokenType.EOF, '', -1, -1))
+        self.tokens: Tuple[Token, ...] = tuple(tokens)
+        # Token types as a flat int array, so the parser's type checks are
+        # integer compares that never dereference a Token
+        self.types = array('i', [token.type for token in self.tokens])
         self.current = 0
+        self.debug = debug
         self.debug_indent = 0
-
-    def debug_print(self, message: str):
-        """Print debug message with indentation."""
-        print("  " * self.debug_indent + message)
+        
+        # Index of the matching RBRACE for every LBRACE, found in one pass
+        self.brace_match: Dict[int, int] = {}
+        stack: List[int] = []
+        for i, kind in enumerate(self.types):
+            if kind == TokenType.LBRACE:
+                stack.append(i)
+            elif kind == TokenType.RBRACE and stack:
+                self.brace_match[stack.pop()] = i
+
+    def debug_print(self, message: str) -> None:
+        """Print debug message with indentation when debugging is enabled."""
+        if self.debug:
+            print("  " * self.debug_indent + message)
 
     def match(self, expected_type: TokenType) -> Token:
         """Match current token with expected type and advance."""
-        if self.current >= len(self.tokens):
-            raise ParseError(f"Unexpected end of input, expected {expected_type}", -1, -1)
-        
         current_token = self.tokens[self.current]
-        if current_token.type == expected_type:
-            self.debug_print(f"Matched {current_token}")
+        if self.types[self.current] == expected_type:
+            if self.debug:
+                self.debug_print(f"Matched {current_token}")
             self.current += 1
             return current_token
         raise ParseError(
@@ -140,10 +174,26 @@ class Parser:
 
     def peek(self) -> Token:
         """Look at current token without consuming it."""
-        if self.current >= len(self.tokens):
-            return Token(TokenType.EOF, '', -1, -1)
         return self.tokens[self.current]
 
+    def parse_block(self) -> List[Statement]:
+        """Parse a brace-delimited list of statements."""
+        close = self.brace_match.get(self.current)
+        self.match(TokenType.LBRACE)
+        if close is None:
+            eof = self.tokens[-1]
+            raise ParseError(
+                f"Expected {TokenType.RBRACE} but got {eof.type}",
+                eof.line,
+                eof.column
+            )
+        
+        statements = []
+        while self.current < close:
+            statements.append(self.parse_statement())
+        self.match(TokenType.RBRACE)
+        return statements
+
     def parse_program(self) -> Program:
         """Parse the complete program."""
         self.debug_print("Parsing program")
@@ -153,13 +203,14 @@ class Parser:
         statements = []
         
         # Parse variable declarations
-        while self.peek().type == TokenType.VAR:
+        while self.types[self.current] == TokenType.VAR:
             self.debug_print("Found variable declaration")
             declarations.append(self.parse_declaration())
             
         # Parse statements
-        while self.peek().type != TokenType.EOF:
-            self.debug_print(f"Found statement starting with {self.peek()}")
+        while self.types[self.current] != TokenType.EOF:
+            if self.debug:
+                self.debug_print(f"Found statement starting with {self.peek()}")
             statements.append(self.parse_statement())
             
         self.debug_indent -= 1
@@ -173,7 +224,7 @@ class Parser:
         self.match(TokenType.VAR)
         name_token = self.match(TokenType.IDENTIFIER)
         self.match(TokenType.ASSIGN)
-        type_token = self.match(TokenType.INTEGER) if self.peek().type == TokenType.INTEGER else self.match(TokenType.FLOAT)
+        type_token = self.match(TokenType.INTEGER) if self.types[self.current] == TokenType.INTEGER else self.match(TokenType.FLOAT)
         self.match(TokenType.SEMICOLON)
         
         self.debug_indent -= 1
@@ -189,18 +240,19 @@ class Parser:
         self.debug_print("Parsing statement")
         self.debug_indent += 1
         
-        token = self.peek()
-        result = None
+        kind = self.types[self.current]
+        result: Statement
         
-        if token.type == TokenType.IDENTIFIER:
+        if kind == TokenType.IDENTIFIER:
             result = self.parse_assignment()
-        elif token.type == TokenType.IF:
+        elif kind == TokenType.IF:
             result = self.parse_if_statement()
-        elif token.type == TokenType.WHILE:
+        elif kind == TokenType.WHILE:
             result = self.parse_while_statement()
-        elif token.type == TokenType.PRINT:
+        elif kind == TokenType.PRINT:
             result = self.parse_print_statement()
         else:
+            token = self.tokens[self.current]
             raise ParseError(
                 f"Unexpected token {token.type}",
                 token.line,
@@ -237,40 +289,25 @@ class Parser:
         self.match(TokenType.LPAREN)
         condition = self.parse_expression()
         self.match(TokenType.RPAREN)
-        self.match(TokenType.LBRACE)
-        
-        then_block = []
-        while self.peek().type != TokenType.RBRACE:
-            then_block.append(self.parse_statement())
-        self.match(TokenType.RBRACE)
+        then_block = self.parse_block()
         
         elif_blocks = []
         else_block = None
         
         # Parse else if blocks
-        while self.peek().type == TokenType.IF:
+        while self.types[self.current] == TokenType.IF:
             self.match(TokenType.IF)  # Consume 'if'
             self.match(TokenType.LPAREN)
             elif_condition = self.parse_expression()
             self.match(TokenType.RPAREN)
-            self.match(TokenType.LBRACE)
-            
-            elif_statements = []
-            while self.peek().type != TokenType.RBRACE:
-                elif_statements.append(self.parse_statement())
-            self.match(TokenType.RBRACE)
+            elif_statements = self.parse_block()
             
             elif_blocks.append((elif_condition, elif_statements))
         
         # Parse else block if present
-        if self.peek().type == TokenType.ELSE:
+        if self.types[self.current] == TokenType.ELSE:
             self.match(TokenType.ELSE)
-            self.match(TokenType.LBRACE)
-            
-            else_block = []
-            while self.peek().type != TokenType.RBRACE:
-                else_block.append(self.parse_statement())
-            self.match(TokenType.RBRACE)
+            else_block = self.parse_block()
         
         self.debug_indent -= 1
         return IfStmt(condition, then_block, elif_blocks, else_block, if_token.line, if_token.column)
@@ -284,12 +321,7 @@ class Parser:
         self.match(TokenType.LPAREN)
         condition = self.parse_expression()
         self.match(TokenType.RPAREN)
-        
-        self.match(TokenType.LBRACE)
-        body = []
-        while self.peek().type != TokenType.RBRACE:
-            body.append(self.parse_statement())
-        self.match(TokenType.RBRACE)
+        body = self.parse_block()
         
         self.debug_indent -= 1
         return WhileStmt(condition, body, token.line, token.column)
@@ -312,61 +344,26 @@ class Parser:
         """Parse expression."""
         self.debug_print("Parsing expression")
         self.debug_indent += 1
-        result = self.parse_comparison()
+        result = self._parse_expr(0)
         self.debug_indent -= 1
         return result
 
-    def parse_comparison(self) -> Expression:
-        """Parse comparison expression."""
-        self.debug_print("Parsing comparison")
-        self.debug_indent += 1
-        
-        expr = self.parse_additive()
-        
-        while self.peek().type in [TokenType.EQUALS, TokenType.NOT_EQUALS, 
-                                 TokenType.LESS_THAN, TokenType.GREATER_THAN,
-                                 TokenType.LESS_THAN_OR_EQUAL, TokenType.GREATER_THAN_OR_EQUAL]:
-            operator = self.peek()
-            self.debug_print(f"Found comparison operator: {operator}")
-            self.current += 1
-            right = self.parse_additive()
-            expr = BinaryOp(expr, operator, right, operator.line, operator.column)
-            
-        self.debug_indent -= 1
-        return expr
-
-    def parse_additive(self) -> Expression:
-        """Parse additive expression."""
-        self.debug_print("Parsing additive")
-        self.debug_indent += 1
-        
-        expr = self.parse_multiplicative()
-        
-        while self.peek().type in [TokenType.PLUS, TokenType.MINUS]:
-            operator = self.peek()
-            self.debug_print(f"Found additive operator: {operator}")
-            self.current += 1
-            right = self.parse_multiplicative()
-            expr = BinaryOp(expr, operator, right, operator.line, operator.column)
-            
-        self.debug_indent -= 1
-        return expr
-
-    def parse_multiplicative(self) -> Expression:
-        """Parse multiplicative expression."""
-        self.debug_print("Parsing multiplicative")
-        self.debug_indent += 1
-        
+    def _parse_expr(self, min_prec: int) -> Expression:
+        """Parse a binary expression by precedence climbing."""
         expr = self.parse_primary()
+        types = self.types
         
-        while self.peek().type in [TokenType.MULTIPLY, TokenType.DIVIDE]:
-            operator = self.peek()
-            self.debug_print(f"Found multiplicative operator: {operator}")
+        while True:
+            prec = _PREC.get(types[self.current], -1)
+            if prec < min_prec:
+                break
+            operator = self.tokens[self.current]
+            if self.debug:
+                self.debug_print(f"Found binary operator: {operator}")
             self.current += 1
-            right = self.parse_primary()
+            right = self._parse_expr(prec + 1)
             expr = BinaryOp(expr, operator, right, operator.line, operator.column)
             
-        self.debug_indent -= 1
         return expr
 
     def parse_primary(self) -> Expression:
@@ -374,28 +371,34 @@ class Parser:
         self.debug_print("Parsing primary")
         self.debug_indent += 1
         
-        token = self.peek()
-        result = None
+        token = self.tokens[self.current]
+        kind = self.types[self.current]
+        result: Expression
         
-        if token.type in [TokenType.INTEGER_LITERAL, TokenType.FLOAT_LITERAL]:
-            self.debug_print(f"Found literal: {token}")
+        if kind in _LITERALS:
+            if self.debug:
+                self.debug_print(f"Found literal: {token}")
             self.current += 1
-            value = int(token.value) if token.type == TokenType.INTEGER_LITERAL else float(token.value)
-            result = Literal(value, token.line, token.column)
+            if kind == TokenType.INTEGER_LITERAL:
+                result = Literal(int(token.value), token.line, token.column, "bombardino")
+            else:
+                result = Literal(float(token.value), token.line, token.column, "crocodilo")
             
-        elif token.type == TokenType.IDENTIFIER:
-            self.debug_print(f"Found identifier: {token}")
+        elif kind == TokenType.IDENTIFIER:
+            if self.debug:
+                self.debug_print(f"Found identifier: {token}")
             self.current += 1
             result = Identifier(token.value, token.line, token.column)
             
-        elif token.type == TokenType.LPAREN:
+        elif kind == TokenType.LPAREN:
             self.debug_print("Found parenthesized expression")
             self.current += 1
             result = self.parse_expression()
             self.match(TokenType.RPAREN)
             
-        elif token.type in [TokenType.PLUS, TokenType.MINUS]:
-            self.debug_print(f"Found unary operator: {token}")
+        elif kind in _UNARY_OPS:
+            if self.debug:
+                self.debug_print(f"Found unary operator: {token}")
             self.current += 1
             operand = self.parse_primary()
             result = UnaryOp(token, operand, token.line, token.column)
@@ -3,56 +3,147 @@ Semantic Analyzer for the Mini Compiler.
 This module performs type checking and scope validation.
 """
 
-from typing import Dict, Set, Optional
+import sys
+from collections.abc import Callable
+from typing import Any, NoReturn, Protocol
 from .parser import (
-    Node, Program, VarDeclaration, Statement, AssignmentStmt,
+    Program, VarDeclaration, Statement, AssignmentStmt,
     IfStmt, WhileStmt, Expression, BinaryOp, UnaryOp, Literal,
     Identifier, PrintStmt
 )
 from .lexer import TokenType
 
+# Type names. Every type string the analyzer handles is interned (these
+# constants, declared types, and literal type names, which are string
+# constants in the parser), so types are compared with `is`
+_BOOL = sys.intern("boolean")
+_INT = sys.intern("bombardino")
+_FLT = sys.intern("crocodilo")
+_NUMERIC_TYPES = frozenset({_INT, _FLT})
+
+# Operator categories for the type rules
+_ARITH_OPS = frozenset({TokenType.PLUS, TokenType.MINUS, TokenType.MULTIPLY, TokenType.DIVIDE})
+_CMP_OPS = frozenset({
+    TokenType.EQUALS, TokenType.NOT_EQUALS,
+    TokenType.LESS_THAN, TokenType.GREATER_THAN,
+    TokenType.LESS_THAN_OR_EQUAL, TokenType.GREATER_THAN_OR_EQUAL,
+})
+_UNARY_OPS = frozenset({TokenType.PLUS, TokenType.MINUS})
+
 class SemanticError(Exception):
     """Exception raised for semantic errors."""
-    pass
-
-class Symbol:
-    """Symbol table entry."""
-    def __init__(self, name: str, type_: str, line: int, column: int):
-        self.name = name
-        self.type = type_
+    def __init__(self, message: str, line: int = 0, column: int = 0):
+        super().__init__(message)
         self.line = line
         self.column = column
 
+# Error construction lives in these helpers so the checks themselves stay
+# small; each raises a SemanticError positioned at the offending node.
+class _Positioned(Protocol):
+    """Any AST node carrying a source position."""
+    line: int
+    column: int
+
+_MISMATCH_DETAIL = {
+    "assignment": "Expected {0}, got {1}",
+    "binary operation": "Cannot operate on {0} and {1}",
+    "comparison": "Cannot compare {0} and {1}",
+}
+
+def _err_type_mismatch(context: str, node: _Positioned, first: str, second: str) -> NoReturn:
+    detail = _MISMATCH_DETAIL[context].format(first, second)
+    raise SemanticError(
+        f"Type mismatch in {context} at line {node.line}, column {node.column}. {detail}",
+        node.line, node.column
+    )
+
+def _err_condition(node: _Positioned) -> NoReturn:
+    raise SemanticError(
+        f"Condition must be boolean at line {node.line}, column {node.column}",
+        node.line, node.column
+    )
+
+def _err_unary_operand(node: UnaryOp, operand_type: str) -> NoReturn:
+    raise SemanticError(
+        f"Invalid type for unary operator at line {node.line}, "
+        f"column {node.column}. Expected number, got {operand_type}",
+        node.line, node.column
+    )
+
+def _err_unknown_operator(node: _Positioned, op: TokenType, kind: str = "") -> NoReturn:
+    raise SemanticError(
+        f"Unknown {kind}operator {op} at line {node.line}, column {node.column}",
+        node.line, node.column
+    )
+
+def _rule_arith(left_type: str, right_type: str, node: BinaryOp) -> str:
+    """Arithmetic operands must share a type, which is the result type."""
+    if left_type is not right_type:
+        _err_type_mismatch("binary operation", node, left_type, right_type)
+    return left_type
+
+def _rule_cmp(left_type: str, right_type: str, node: BinaryOp) -> str:
+    """Compared operands must share a type; the result is boolean."""
+    if left_type is not right_type:
+        _err_type_mismatch("comparison", node, left_type, right_type)
+    return _BOOL
+
+# Type rule for each binary operator
+_BINOP_RULES: dict[TokenType, Callable[[str, str, BinaryOp], str]] = {
+    **dict.fromkeys(_ARITH_OPS, _rule_arith),
+    **dict.fromkeys(_CMP_OPS, _rule_cmp),
+}
+
 class SymbolTable:
     """Symbol table for tracking variable declarations and types."""
-    def __init__(self):
-        self.symbols: Dict[str, Symbol] = {}
+    def __init__(self) -> None:
+        # Kept as parallel maps: the hot path only needs a variable's type,
+        # and declaration positions are read only when reporting errors
+        self._types: dict[str, str] = {}
+        self._loc: dict[str, tuple[int, int]] = {}
         
     def declare(self, name: str, type_: str, line: int, column: int) -> None:
         """Declare a new variable."""
-        if name in self.symbols:
-            symbol = self.symbols[name]
+        prev = self._loc.get(name)
+        if prev is not None:
+            prev_line, prev_column = prev
             raise SemanticError(
-                f"Variable '{name}' already declared at line {symbol.line}, "
-                f"column {symbol.column}"
+                f"Variable '{name}' already declared at line {prev_line}, "
+                f"column {prev_column}",
+                line, column
             )
-        self.symbols[name] = Symbol(name, type_, line, column)
+        self._types[name] = sys.intern(type_)
+        self._loc[name] = (line, column)
         
-    def lookup(self, name: str, line: int, column: int) -> Symbol:
-        """Look up a variable in the symbol table."""
-        if name not in self.symbols:
+    def lookup(self, name: str, line: int, column: int) -> str:
+        """Look up a variable in the symbol table and return its type."""
+        type_ = self._types.get(name)
+        if type_ is None:
             raise SemanticError(
-                f"Undefined variable '{name}' at line {line}, column {column}"
+                f"Undefined variable '{name}' at line {line}, column {column}",
+                line, column
             )
-        return self.symbols[name]
+        return type_
 
 class SemanticAnalyzer:
     """
     Semantic analyzer that performs type checking and scope validation.
     """
     
-    def __init__(self):
+    def __init__(self) -> None:
         self.symbol_table = SymbolTable()
+        # Node-class jump tables for statement and expression dispatch
+        self._stmt_dispatch: dict[type, Callable[[Any], None]] = {
+            AssignmentStmt: self.visit_assignment,
+            IfStmt: self.visit_if_statement,
+            WhileStmt: self.visit_while_statement,
+            PrintStmt: self.visit_print_statement,
+        }
+        # Leaf expressions only; operators are handled by the expression walk
+        self._expr_dispatch: dict[type, Callable[[Any], str]] = {
+            Literal: self.visit_literal,
+            Identifier: self.visit_identifier,
+        }
 
     def analyze(self, ast: Program) -> None:
         """Analyze the complete program."""
@@ -60,9 +151,30 @@ class SemanticAnalyzer:
         for decl in ast.declarations:
             self.visit_declaration(decl)
             
-        # Then analyze all statements
-        for stmt in ast.statements:
-            self.visit_statement(stmt)
+        # Then analyze all statements, in order, from a worklist (next one
+        # last) rather than recursing into blocks, with the methods the loop
+        # calls bound to locals once
+        worklist: list[Statement] = list(reversed(ast.statements))
+        pop, extend = worklist.pop, worklist.extend
+        visit_statement, visit_expression = self.visit_statement, self.visit_expression
+        check_condition = self.check_condition
+        while worklist:
+            stmt = pop()
+            if type(stmt) is PrintStmt:
+                # A print only needs its expression checked, so skip the
+                # visit_print_statement hop
+                visit_expression(stmt.expression)
+            elif type(stmt) is IfStmt:
+                # Queue the then block, followed by the else block if it exists
+                check_condition(stmt)
+                if stmt.else_block:
+                    extend(reversed(stmt.else_block))
+                extend(reversed(stmt.then_block))
+            elif type(stmt) is WhileStmt:
+                check_condition(stmt)
+                extend(reversed(stmt.body))
+            else:
+                visit_statement(stmt)
 
     def visit_declaration(self, node: VarDeclaration) -> None:
         """Process variable declaration."""
@@ -70,58 +182,45 @@ class SemanticAnalyzer:
 
     def visit_statement(self, node: Statement) -> None:
         """Process a statement node."""
-        if isinstance(node, AssignmentStmt):
-            self.visit_assignment(node)
-        elif isinstance(node, IfStmt):
-            self.visit_if_statement(node)
-        elif isinstance(node, WhileStmt):
-            self.visit_while_statement(node)
-        elif isinstance(node, PrintStmt):
-            self.visit_print_statement(node)
-        else:
-            raise SemanticError(f"Unknown statement type: {type(node)}")
+        try:
+            visit = self._stmt_dispatch[type(node)]
+        except KeyError:
+            raise SemanticError(f"Unknown statement type: {type(node)}") from None
+        visit(node)
 
     def visit_assignment(self, node: AssignmentStmt) -> None:
         """Process assignment statement."""
         # Check variable exists and get its type
-        symbol = self.symbol_table.lookup(node.variable, node.line, node.column)
+        var_type = self.symbol_table.lookup(node.variable, node.line, node.column)
         
         # Check expression type matches variable type
         expr_type = self.visit_expression(node.expression)
-        if symbol.type != expr_type:
-            raise SemanticError(
-                f"Type mismatch in assignment at line {node.line}, column {node.column}. "
-                f"Expected {symbol.type}, got {expr_type}"
-            )
+        if var_type is not expr_type:
+            _err_type_mismatch("assignment", node, var_type, expr_type)
+
+    def check_condition(self, node: IfStmt | WhileStmt) -> None:
+        """Check that an if or while condition is boolean."""
+        if self.visit_expression(node.condition) is not _BOOL:
+            _err_condition(node)
 
     def visit_if_statement(self, node: IfStmt) -> None:
         """Process if statement."""
-        # Check condition is boolean
-        condition_type = self.visit_expression(node.condition)
-        if condition_type != "boolean":
-            raise SemanticError(
-                f"Condition must be boolean at line {node.line}, column {node.column}"
-            )
-            
-        # Check then block
+        self.check_condition(node)
+        
+        # Process then block
         for stmt in node.then_block:
             self.visit_statement(stmt)
             
-        # Check else block if it exists
+        # Process else block if it exists
         if node.else_block:
             for stmt in node.else_block:
                 self.visit_statement(stmt)
 
     def visit_while_statement(self, node: WhileStmt) -> None:
         """Process while statement."""
-        # Check condition is boolean
-        condition_type = self.visit_expression(node.condition)
-        if condition_type != "boolean":
-            raise SemanticError(
-                f"Condition must be boolean at line {node.line}, column {node.column}"
-            )
-            
-        # Check body
+        self.check_condition(node)
+        
+        # Process body
         for stmt in node.body:
             self.visit_statement(stmt)
 
@@ -132,76 +231,60 @@ class SemanticAnalyzer:
 
     def visit_expression(self, node: Expression) -> str:
         """Process an expression node and return its type."""
-        if isinstance(node, BinaryOp):
-            return self.visit_binary_op(node)
-        elif isinstance(node, UnaryOp):
-            return self.visit_unary_op(node)
-        elif isinstance(node, Literal):
-            return self.visit_literal(node)
-        elif isinstance(node, Identifier):
-            return self.visit_identifier(node)
-        else:
-            raise SemanticError(f"Unknown expression type: {type(node)}")
-
-    def visit_binary_op(self, node: BinaryOp) -> str:
-        """Process binary operation and return result type."""
-        left_type = self.visit_expression(node.left)
-        right_type = self.visit_expression(node.right)
-        
-        # Type checking rules for operators
-        if node.operator.type in [TokenType.PLUS, TokenType.MINUS, 
-                                TokenType.MULTIPLY, TokenType.DIVIDE]:
-            if left_type != right_type:
-                raise SemanticError(
-                    f"Type mismatch in binary operation at line {node.line}, "
-                    f"column {node.column}. Cannot operate on {left_type} and {right_type}"
-                )
-            return left_type
-            
-        elif node.operator.type in [TokenType.EQUALS, TokenType.NOT_EQUALS,
-                                  TokenType.LESS_THAN, TokenType.GREATER_THAN,
-                                  TokenType.LESS_THAN_OR_EQUAL, TokenType.GREATER_THAN_OR_EQUAL]:
-            if left_type != right_type:
-                raise SemanticError(
-                    f"Type mismatch in comparison at line {node.line}, "
-                    f"column {node.column}. Cannot compare {left_type} and {right_type}"
-                )
-            return "boolean"
-            
-        else:
-            raise SemanticError(
-                f"Unknown operator {node.operator.type} at line {node.line}, "
-                f"column {node.column}"
-            )
+        # Iterative post-order walk: an operator node is pushed back with
+        # its flag set before its operands, and on the second pop combines
+        # the operand types left on the type stack
+        leaf_dispatch = self._expr_dispatch
+        check_binary_op, check_unary_op = self.check_binary_op, self.check_unary_op
+        work: list[tuple[Expression, bool]] = [(node, False)]
+        push, pop = work.append, work.pop
+        types: list[str] = []
+        while work:
+            node, operands_done = pop()
+            if isinstance(node, BinaryOp):
+                if operands_done:
+                    right_type = types.pop()
+                    types.append(check_binary_op(node, types.pop(), right_type))
+                else:
+                    push((node, True))
+                    push((node.right, False))
+                    push((node.left, False))
+            elif isinstance(node, UnaryOp):
+                if operands_done:
+                    types.append(check_unary_op(node, types.pop()))
+                else:
+                    push((node, True))
+                    push((node.operand, False))
+            else:
+                kind = type(node)
+                try:
+                    visit = leaf_dispatch[kind]
+                except KeyError:
+                    raise SemanticError(f"Unknown expression type: {kind}") from None
+                types.append(visit(node))
+        return types.pop()
 
-    def visit_unary_op(self, node: UnaryOp) -> str:
-        """Process unary operation and return result type."""
-        operand_type = self.visit_expression(node.operand)
-        
-        if node.operator.type in [TokenType.PLUS, TokenType.MINUS]:
-            if operand_type not in ["bombardino", "crocodilo"]:
-                raise SemanticError(
-                    f"Invalid type for unary operator at line {node.line}, "
-                    f"column {node.column}. Expected number, got {operand_type}"
-                )
+    def check_binary_op(self, node: BinaryOp, left_type: str, right_type: str) -> str:
+        """Check a binary operation given its operand types and return result type."""
+        op = node.operator.type
+        rule = _BINOP_RULES.get(op)
+        if rule is None:
+            _err_unknown_operator(node, op)
+        return rule(left_type, right_type, node)
+
+    def check_unary_op(self, node: UnaryOp, operand_type: str) -> str:
+        """Check a unary operation given its operand type and return result type."""
+        op = node.operator.type
+        if op in _UNARY_OPS:
+            if operand_type not in _NUMERIC_TYPES:
+                _err_unary_operand(node, operand_type)
             return operand_type
-            
-        else:
-            raise SemanticError(
-                f"Unknown unary operator {node.operator.type} at line {node.line}, "
-                f"column {node.column}"
-            )
+        _err_unknown_operator(node, op, "unary ")
 
     def visit_literal(self, node: Literal) -> str:
         """Process literal value and return its type."""
-        if isinstance(node.value, int):
-            return "bombardino"
-        elif isinstance(node.value, float):
-            return "crocodilo"
-        else:
-            raise SemanticError(f"Unknown literal type: {type(node.value)}")
+        return node.type_name
 
     def visit_identifier(self, node: Identifier) -> str:
         """Process identifier and return its type."""
-        symbol = self.symbol_table.lookup(node.name, node.line, node.column)
-        return symbol.type 
\ No newline at end of file
+        return self.symbol_table.lookup(node.name, node.line, node.column) 
\ No newline at end of file
@@ -1,14 +1,35 @@
+import os
 from setuptools import setup, find_packages
 
+# Optionally compile the hot modules to C extensions with mypyc
+# (MINI_COMPILER_MYPYC=1 pip install --no-build-isolation --use-pep517 -e .,
+# with the "fast" extra installed). The pure-Python package is used otherwise.
+ext_modules = []
+if os.environ.get("MINI_COMPILER_MYPYC") == "1":
+    from mypyc.build import mypycify
+    ext_modules = mypycify([
+        "compiler/lexer.py",
+        "compiler/parser.py",
+        "compiler/semantic.py",
+        "compiler/intermediate.py",
+        "compiler/codegen.py",
+    ])
+
 setup(
     name="mini-compiler",
     version="0.1.0",
     packages=find_packages(),
     install_requires=[],
-    python_requires=">=3.7",
+    extras_require={
+        # Toolchain for the optional mypyc build; setuptools and wheel are
+        # needed because that build runs without build isolation
+        "fast": ["mypy", "setuptools", "wheel"],
+    },
+    python_requires=">=3.10",
+    ext_modules=ext_modules,
     entry_points={
         "console_scripts": [
             "mini-compiler=compiler.main:main",
         ],
     },
-) 
\ No newline at end of file
+)